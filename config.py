@@ -4,60 +4,69 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Snapshot the environment once so every setting below is a plain dict lookup
+_ENV = os.environ.copy()
+
+def _get(key, default=None, cast=str):
+    """Look up an environment value, casting non-empty values and falling back otherwise"""
+    value = _ENV.get(key)
+    return cast(value) if value else default
+
 class ConfigValidationError(Exception):
     pass
 
 class Config(object):
-    LOG_FORMAT = os.getenv("LOG_FORMAT") or '%(asctime)s - %(levelname)s - %(message)s \t - %(name)s (%(filename)s).%(funcName)s(%(lineno)d) '
-    LOG_LEVEL = os.getenv("LOG_LEVEL") or 'INFO'
-    APPNAME = os.getenv("APPNAME") or 'Truth Social Monitor'
-    ENV = os.getenv("ENV") or "DEV"
-    REPEAT_DELAY = int(os.getenv("REPEAT_DELAY") or 10)  # 10 seconds default (optimized for speed)
+    LOG_FORMAT = _get("LOG_FORMAT", '%(asctime)s - %(levelname)s - %(message)s \t - %(name)s (%(filename)s).%(funcName)s(%(lineno)d) ')
+    LOG_LEVEL = _get("LOG_LEVEL", 'INFO')
+    APPNAME = _get("APPNAME", 'Truth Social Monitor')
+    ENV = _get("ENV", "DEV")
+    REPEAT_DELAY = _get("REPEAT_DELAY", 10, int)  # 10 seconds default (optimized for speed)
 
     # Discord configuration
-    DISCORD_NOTIFY = os.getenv("DISCORD_NOTIFY", 'True').lower() == 'true'
-    DISCORD_USERNAME = os.getenv("DISCORD_USERNAME") or "Truth Social Bot"
-    DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL")
-    
+    DISCORD_NOTIFY = _get("DISCORD_NOTIFY", 'True').lower() == 'true'
+    DISCORD_USERNAME = _get("DISCORD_USERNAME", "Truth Social Bot")
+    DISCORD_WEBHOOK_URL = _get("DISCORD_WEBHOOK_URL")
+
     # Supabase configuration
-    SUPABASE_URL = os.getenv("SUPABASE_URL")
-    SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-    SUPABASE_TABLE = os.getenv("SUPABASE_TABLE") or "posts"
+    SUPABASE_URL = _get("SUPABASE_URL")
+    SUPABASE_KEY = _get("SUPABASE_KEY")
+    SUPABASE_TABLE = _get("SUPABASE_TABLE", "posts")
 
     # Truth Social configuration
-    TRUTH_USERNAME = os.getenv("TRUTH_USERNAME")
-    TRUTH_INSTANCE = os.getenv("TRUTH_INSTANCE") or "truthsocial.com"
-    POST_TYPE = os.getenv("POST_TYPE") or "post"  # Default to "post" if not specified
-    
+    TRUTH_USERNAME = _get("TRUTH_USERNAME")
+    TRUTH_INSTANCE = _get("TRUTH_INSTANCE", "truthsocial.com")
+    POST_TYPE = _get("POST_TYPE", "post")  # Default to "post" if not specified
+
     # Request configuration
-    REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT") or 30)
-    MAX_RETRIES = int(os.getenv("MAX_RETRIES") or 3)
+    REQUEST_TIMEOUT = _get("REQUEST_TIMEOUT", 30, int)
+    MAX_RETRIES = _get("MAX_RETRIES", 3, int)
 
     # FlareSolverr configuration
-    FLARESOLVERR_ADDRESS = os.getenv("FLARESOLVERR_ADDRESS") or "localhost"
-    FLARESOLVERR_PORT = int(os.getenv("FLARESOLVERR_PORT") or 8191)
+    FLARESOLVERR_ADDRESS = _get("FLARESOLVERR_ADDRESS", "localhost")
+    FLARESOLVERR_PORT = _get("FLARESOLVERR_PORT", 8191, int)
+
 
 
-    def __init__(self):
-        self.validate_config()
+def validate_config(cls):
+    """Validate required configuration settings"""
+    errors = []
 
-    def validate_config(self):
-        """Validate required configuration settings"""
-        errors = []
+    if not cls.TRUTH_USERNAME:
+        errors.append("TRUTH_USERNAME is required")
 
-        if not self.TRUTH_USERNAME:
-            errors.append("TRUTH_USERNAME is required")
+    if cls.DISCORD_NOTIFY:
+        if not cls.DISCORD_WEBHOOK_URL:
+            errors.append("DISCORD_WEBHOOK_URL is required when DISCORD_NOTIFY is enabled")
 
-        if self.DISCORD_NOTIFY:
-            if not self.DISCORD_WEBHOOK_URL:
-                errors.append("DISCORD_WEBHOOK_URL is required when DISCORD_NOTIFY is enabled")
+    if not cls.SUPABASE_URL:
+        errors.append("SUPABASE_URL is required")
+    if not cls.SUPABASE_KEY:
+        errors.append("SUPABASE_KEY is required")
 
-        if not self.SUPABASE_URL:
-            errors.append("SUPABASE_URL is required")
-        if not self.SUPABASE_KEY:
-            errors.append("SUPABASE_KEY is required")
+    if errors:
+        raise ConfigValidationError("\n".join(errors))
 
-        if errors:
-            raise ConfigValidationError("\n".join(errors))
+    return True
 
-        return True
+# Fail fast: bad configuration should surface at import, not at first use
+validate_config(Config)
@@ -1,19 +1,29 @@
+import collections
+import hashlib
+import json
 import logging
+import queue
+import sys
+import tempfile
+import threading
 import time
 from datetime import datetime, timezone
-import requests
+import httpx
 from config import Config
+from dataclasses import dataclass, field
 from discord_webhook import DiscordWebhook
 from supabase import create_client, Client
 from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 from ratelimit import limits, sleep_and_retry
 import backoff
 from bs4 import BeautifulSoup
 import re
 
-# Configure logging
-config = Config()
+# Configure logging; Config is validated at import and used as a plain
+# class-attribute namespace, no instance needed
+config = Config
 logging.basicConfig(
     format=config.LOG_FORMAT,
     level=logging.DEBUG if config.LOG_LEVEL.upper() == 'DEBUG' else logging.INFO,
@@ -21,12 +31,71 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# In-memory cache to track processed posts (fallback if Supabase fails)
-processed_posts_cache = set()
+# Shared HTTP/2-capable client so all requests multiplex over pooled
+# keep-alive connections instead of paying a fresh TCP+TLS handshake per call
+CLIENT = httpx.Client(
+    http2=True,
+    timeout=config.REQUEST_TIMEOUT,
+    limits=httpx.Limits(max_keepalive_connections=8),
+    headers={
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Accept': 'application/json'
+    },
+)
+
+class LRUSet:
+    """Set with a bounded size that evicts the least recently used entries.
+
+    Keeps the processed-posts cache from growing without bound over weeks of
+    uptime while keeping membership checks O(1). All operations hold a lock,
+    since the Discord worker thread mutates the cache concurrently with the
+    poll loop.
+    """
+
+    def __init__(self, maxsize=10_000):
+        self._maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return True
+            return False
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def add(self, key):
+        with self._lock:
+            self._entries[key] = None
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def update(self, keys):
+        for key in keys:
+            self.add(key)
+
+# In-memory cache to track processed posts (fallback if Supabase fails),
+# bounded so long uptimes don't leak memory
+processed_posts_cache = LRUSet()
 
 # Cache user ID to avoid repeated lookups
 cached_user_id = None
 
+# Hash of the last statuses body; FlareSolverr v2 drops request headers and
+# returns no real response headers, so conditional GETs can't work through it.
+# Comparing body hashes still lets the idle path skip re-parsing and
+# re-classifying an unchanged feed.
+_last_body_hash = None
+
 # Keywords that trigger @everyone mention and post sending
 KEYWORDS = [
     'strike', 'striking', 'ISIS', 'Syria', 'soil', 'Nigeria', 'Iran', 'Israel', 'Yemen',
@@ -34,10 +103,35 @@ KEYWORDS = [
     'negotiations', 'agreement', 'negotiate', 'meeting'
 ]
 
+# Precompiled patterns for the per-post text cleanup hot path
+_RE_BLANKLINES = re.compile(r'\n\s*\n')
+_RE_SPACES = re.compile(r' +')
+_RE_URL = re.compile(r'(?<![\(\[])(https?://\S+)(?![\)\]])')
+_RE_RT = re.compile(r'^RT[ @]', re.IGNORECASE)
+_RE_LEADING_TAGS = re.compile(r'^(?:\s*<[^>]+>)+\s*')
+
+# fromisoformat accepts a trailing 'Z' natively on 3.11+; only pay for the
+# string replace on older interpreters
+if sys.version_info >= (3, 11):
+    _parse_dt = datetime.fromisoformat
+else:
+    def _parse_dt(value):
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+# Capitalized once here rather than per formatted message
+_POST_TYPE_CAP = config.POST_TYPE.capitalize()
+
 # Rate limit: 1 request per 2 seconds for Discord
 DISCORD_CALLS = 30
 DISCORD_PERIOD = 60
 
+# Separate buckets for direct Truth Social requests and FlareSolverr, so a
+# retry storm can't burst either host hard enough to get the IP banned
+REQUEST_CALLS = 60
+REQUEST_PERIOD = 60
+FLARESOLVERR_CALLS = 20
+FLARESOLVERR_PERIOD = 60
+
 @sleep_and_retry
 @limits(calls=DISCORD_CALLS, period=DISCORD_PERIOD)
 def rate_limited_discord_send(webhook):
@@ -46,16 +140,18 @@ def rate_limited_discord_send(webhook):
 
 @backoff.on_exception(
     backoff.expo,
-    (requests.exceptions.RequestException, requests.exceptions.HTTPError),
+    httpx.HTTPError,
     max_tries=config.MAX_RETRIES
 )
+@sleep_and_retry
+@limits(calls=REQUEST_CALLS, period=REQUEST_PERIOD)
 def make_request(url, headers):
     """Make HTTP request with retry mechanism"""
     try:
-        response = requests.get(url, headers=headers)
+        response = CLIENT.get(url, headers=headers)
         response.raise_for_status()
         return response
-    except requests.exceptions.HTTPError as e:
+    except httpx.HTTPStatusError as e:
         logger.error(f"HTTP Error {e.response.status_code} for URL {url}")
         logger.error(f"Response headers: {e.response.headers}")
         logger.error(f"Response body: {e.response.text[:500]}")  # First 500 chars of error response
@@ -63,6 +159,40 @@ def make_request(url, headers):
 
 
 
+class FakeResponse:
+    """Mimic a requests.Response object for .json(), .text, .status_code and .headers"""
+
+    def __init__(self, content, status_code=200, headers=None):
+        self._content = content
+        self.status_code = status_code
+        # Normalize header names to lowercase for consistent lookups
+        self.headers = {k.lower(): v for k, v in (headers or {}).items()}
+
+    def json(self):
+        # Try to parse as JSON directly
+        try:
+            return json.loads(self._content)
+        except Exception:
+            # Try to extract JSON from <pre>...</pre> in HTML
+            soup = BeautifulSoup(self._content, "lxml")
+            pre = soup.find("pre")
+            if pre:
+                try:
+                    return json.loads(pre.text)
+                except Exception as e:
+                    logger.error(f"Failed to parse JSON from <pre>: {e}")
+                    logger.error(f"<pre> content (first 500 chars): {pre.text[:500]}")
+                    raise
+            logger.error("No <pre> tag found in FlareSolverr HTML response")
+            logger.error(f"HTML content (first 500 chars): {self._content[:500]}")
+            raise
+
+    @property
+    def text(self):
+        return self._content
+
+@sleep_and_retry
+@limits(calls=FLARESOLVERR_CALLS, period=FLARESOLVERR_PERIOD)
 def make_flaresolverr_request(url, headers=None, params=None):
     """Use FlareSolverr to fetch a URL and return a response-like object."""
     flaresolverr_url = f"http://{config.FLARESOLVERR_ADDRESS}:{config.FLARESOLVERR_PORT}/v1"
@@ -81,42 +211,21 @@ def make_flaresolverr_request(url, headers=None, params=None):
     logger.info(f"Making FlareSolverr request: {url} (params={params})")
 
     try:
-        resp = requests.post(flaresolverr_url, json=payload)
+        resp = CLIENT.post(flaresolverr_url, json=payload)
         resp.raise_for_status()
         result = resp.json()
         if result.get("status") != "ok":
             logger.error(f"FlareSolverr error: {result}")
             raise Exception(f"FlareSolverr error: {result}")
-        response_content = result["solution"]["response"]
-        logger.debug(f"FlareSolverr raw response (first 500 chars): {response_content[:500]}")
-        # Mimic a requests.Response object for .json() and .text
-        class FakeResponse:
-            def __init__(self, content):
-                self._content = content
-            def json(self):
-                import json
-                from bs4 import BeautifulSoup
-                # Try to parse as JSON directly
-                try:
-                    return json.loads(self._content)
-                except Exception:
-                    # Try to extract JSON from <pre>...</pre> in HTML
-                    soup = BeautifulSoup(self._content, "html.parser")
-                    pre = soup.find("pre")
-                    if pre:
-                        try:
-                            return json.loads(pre.text)
-                        except Exception as e:
-                            logger.error(f"Failed to parse JSON from <pre>: {e}")
-                            logger.error(f"<pre> content (first 500 chars): {pre.text[:500]}")
-                            raise
-                    logger.error("No <pre> tag found in FlareSolverr HTML response")
-                    logger.error(f"HTML content (first 500 chars): {self._content[:500]}")
-                    raise
-            @property
-            def text(self):
-                return self._content
-        return FakeResponse(response_content)
+        solution = result["solution"]
+        response_content = solution["response"]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("FlareSolverr raw response (first 500 chars): %s", response_content[:500])
+        return FakeResponse(
+            response_content,
+            status_code=solution.get("status", 200),
+            headers=solution.get("headers"),
+        )
     except Exception as e:
         logger.error(f"FlareSolverr request failed for {url}: {e}")
         raise
@@ -150,96 +259,119 @@ def connect_supabase():
         logger.error(f"Failed to connect to Supabase: {e}")
         raise
 
-def is_post_processed(supabase, post_id):
-    """Check if a post has already been processed (checks both Supabase and cache)"""
-    # First check in-memory cache (fastest)
-    if post_id in processed_posts_cache:
-        logger.debug(f"Post {post_id} found in cache")
-        return True
-    
-    # Then check Supabase
+def warm_processed_cache(supabase):
+    """Pre-warm the in-memory cache with recently processed IDs at startup"""
     try:
-        response = supabase.table(config.SUPABASE_TABLE).select("id").eq("id", post_id).execute()
-        exists = len(response.data) > 0
-        if exists:
-            logger.debug(f"Post {post_id} found in database")
-            # Add to cache for faster future lookups
-            processed_posts_cache.add(post_id)
-        return exists
+        response = (
+            supabase.table(config.SUPABASE_TABLE)
+            .select("id")
+            .order("sent_at", desc=True)
+            .limit(500)
+            .execute()
+        )
+        processed_posts_cache.update(str(row["id"]) for row in response.data)
+        logger.info(f"Pre-warmed processed-posts cache with {len(response.data)} recent IDs")
     except Exception as e:
-        logger.error(f"Error checking if post is processed: {e}")
-        logger.error(f"Post ID: {post_id}")
-        # If we can't check Supabase, rely on cache only
-        return post_id in processed_posts_cache
+        # Non-critical: the per-poll prefetch will repopulate the cache
+        logger.warning(f"Could not pre-warm processed-posts cache: {e}")
 
-def mark_post_processed(supabase, post):
-    """Mark a post as processed in Supabase with additional metadata"""
+def prefetch_processed(supabase, post_ids):
+    """Fetch which of the given post IDs already exist in Supabase in one query"""
+    if not post_ids:
+        return set()
     try:
-        # Build document with only the essential fields that should exist in the table
-        doc = {
-            "id": str(post["id"]),  # Ensure it's a string
-            "content": post.get("content", "") or "",
-            "created_at": post.get("created_at", ""),
-            "sent_at": datetime.now(timezone.utc).isoformat(),
-            "username": post.get("account", {}).get("username", "") or ""
+        response = (
+            supabase.table(config.SUPABASE_TABLE)
+            .select("id")
+            .in_("id", [str(post_id) for post_id in post_ids])
+            .execute()
+        )
+        existing = set(str(row["id"]) for row in response.data)
+        logger.debug("Prefetched %d already-processed posts from database", len(existing))
+        return existing
+    except Exception as e:
+        logger.error(f"Error prefetching processed posts: {e}")
+        # If we can't check Supabase, rely on cache only
+        return set()
+
+def build_post_doc(post):
+    """Build the Supabase document for a processed Post"""
+    # Build document with only the essential fields that should exist in the table
+    doc = {
+        "id": post.id,
+        "content": post.content,
+        "created_at": post.created_at,
+        "sent_at": datetime.now(timezone.utc).isoformat(),
+        "username": post.username
+    }
+
+    # Only add optional fields if they exist in the post
+    if post.display_name:
+        doc["display_name"] = post.display_name
+
+    media_attachments = [
+        {
+            "type": m.get("type"),
+            "url": m.get("url") or m.get("preview_url")
         }
-        
-        # Only add optional fields if they exist in the post
-        display_name = post.get("account", {}).get("display_name")
-        if display_name:
-            doc["display_name"] = display_name
-        
-        media_attachments = [
-            {
-                "type": m.get("type"),
-                "url": m.get("url") or m.get("preview_url")
-            }
-            for m in post.get("media_attachments", [])
-            if m.get("type") in ["image", "video", "gifv"]
-        ]
-        if media_attachments:
-            doc["media_attachments"] = media_attachments
-        # Use upsert to handle duplicate keys gracefully
+        for m in post.media
+        if m.get("type") in ["image", "video", "gifv"]
+    ]
+    if media_attachments:
+        doc["media_attachments"] = media_attachments
+    return doc
+
+def flush_upserts(supabase, docs):
+    """Mark a batch of posts as processed in one Supabase upsert"""
+    if not docs:
+        return
+    try:
+        # PostgREST accepts an array payload, so N docs cost one round trip.
         # Upsert will update if exists, insert if not (based on primary key)
-        logger.debug(f"Attempting to upsert post {post['id']} to table {config.SUPABASE_TABLE}")
-        logger.debug(f"Document to save: {doc}")
-        response = supabase.table(config.SUPABASE_TABLE).upsert(doc).execute()
-        
-        logger.debug(f"Supabase response: {response}")
-        logger.debug(f"Response data: {response.data if hasattr(response, 'data') else 'No data attribute'}")
-        
-        # Verify the post was actually saved
+        logger.debug("Attempting to upsert %d post(s) to table %s", len(docs), config.SUPABASE_TABLE)
+        # Serializing the docs and response objects is expensive, so skip it
+        # entirely unless DEBUG is actually enabled
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Documents to save: %s", docs)
+        response = supabase.table(config.SUPABASE_TABLE).upsert(docs).execute()
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Supabase response: %s", response)
+            logger.debug("Response data: %s", response.data if hasattr(response, 'data') else 'No data attribute')
+
+        # Verify the posts were actually saved
         if response.data and len(response.data) > 0:
-            logger.info(f"Successfully marked post {post['id']} as processed. Response: {response.data}")
+            logger.info(f"Successfully marked {len(response.data)} post(s) as processed")
         else:
-            logger.warning(f"Upsert completed but no data returned for post {post['id']}")
+            logger.warning(f"Upsert completed but no data returned for {len(docs)} post(s)")
             logger.warning(f"Response object: {response}")
-            # Verify by checking if it exists
-            verify_response = supabase.table(config.SUPABASE_TABLE).select("id").eq("id", post["id"]).execute()
-            logger.debug(f"Verification query result: {verify_response.data}")
-            if len(verify_response.data) == 0:
-                raise Exception(f"Post {post['id']} was not saved to database after upsert. Response was: {response}")
+            # Verify by checking if they exist
+            ids = [doc["id"] for doc in docs]
+            verify_response = supabase.table(config.SUPABASE_TABLE).select("id").in_("id", ids).execute()
+            logger.debug("Verification query result: %s", verify_response.data)
+            if len(verify_response.data) < len(ids):
+                raise Exception(f"Posts {ids} were not all saved to database after upsert. Response was: {response}")
             else:
-                logger.info(f"Post {post['id']} verified to exist in database despite empty upsert response")
+                logger.info(f"Posts {ids} verified to exist in database despite empty upsert response")
     except Exception as e:
         error_msg = str(e)
-        logger.error(f"Error marking post as processed: {e}")
-        logger.error(f"Post ID: {post.get('id', 'unknown')}")
-        
+        logger.error(f"Error marking posts as processed: {e}")
+        logger.error(f"Post IDs: {[doc.get('id', 'unknown') for doc in docs]}")
+
         # Check for common Supabase errors
         if "permission denied" in error_msg.lower() or "row-level security" in error_msg.lower():
             logger.error("SUPABASE RLS ERROR: Row Level Security (RLS) is blocking the insert.")
             logger.error("Please check your Supabase RLS policies for the table.")
             logger.error("You may need to create a policy that allows INSERT operations.")
         elif "duplicate key" in error_msg.lower():
-            logger.warning(f"Post {post.get('id')} already exists, but that's okay (upsert should handle this)")
-            # If it's just a duplicate, we can consider it processed
+            logger.warning("Posts already exist, but that's okay (upsert should handle this)")
+            # If it's just a duplicate, we can consider them processed
             return
         elif "relation" in error_msg.lower() and "does not exist" in error_msg.lower():
             logger.error("SUPABASE TABLE ERROR: The table does not exist.")
             logger.error(f"Please verify the table name '{config.SUPABASE_TABLE}' exists in your Supabase project.")
-        
-        # Re-raise to prevent the post from being considered processed
+
+        # Re-raise to prevent the posts from being considered processed
         raise
 
 def send_to_discord(message, media_attachments=None):
@@ -257,15 +389,26 @@ def send_to_discord(message, media_attachments=None):
             delay_between_retries=10  # Wait 10 seconds between retries
         )
         
-        # Handle media attachments
+        # Handle media attachments: downloads are independent and I/O-bound,
+        # so fetch them in parallel instead of serially per attachment
         if media_attachments:
-            for media in media_attachments:
-                if media.get('type') in ['image', 'video', 'gifv']:
-                    url = media.get('url') or media.get('preview_url')
-                    if url:
-                        content, filename = download_media(url)
-                        if content and filename:
-                            webhook.add_file(file=content, filename=filename)
+            urls = [
+                media.get('url') or media.get('preview_url')
+                for media in media_attachments
+                if media.get('type') in ['image', 'video', 'gifv']
+                and (media.get('url') or media.get('preview_url'))
+            ]
+            if urls:
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    for media_file, filename in executor.map(download_media, urls):
+                        if media_file and filename:
+                            # Hand the webhook bytes, not the file object: the
+                            # library re-posts self.files on rate-limit retries
+                            # and a file left at EOF would upload empty
+                            # attachments. Closing here also releases the temp
+                            # file. Memory stays bounded by the 25 MB gate.
+                            with media_file:
+                                webhook.add_file(file=media_file.read(), filename=filename)
         
         logger.info("Sending Discord webhook...")
         response = rate_limited_discord_send(webhook)
@@ -290,18 +433,78 @@ def send_to_discord(message, media_attachments=None):
         logger.error(f"Error sending message to Discord: {e}")
         raise
 
+@dataclass(slots=True)
+class Post:
+    """Typed view of a Truth Social status, parsed from the API JSON once"""
+    id: str
+    content: str
+    created_at: str
+    username: str
+    display_name: str
+    media: list = field(default_factory=list)
+
+    @classmethod
+    def from_json(cls, data):
+        account = data.get('account', {})
+        return cls(
+            id=str(data['id']),
+            content=data.get('content') or data.get('text', '') or '',
+            created_at=data.get('created_at', ''),
+            username=account.get('username', '') or '',
+            display_name=account.get('display_name', '') or '',
+            media=data.get('media_attachments', []) or [],
+        )
+
+# Queue feeding the background Discord worker so the poll loop never blocks
+# on webhook latency or rate-limit sleeps
+_discord_queue = queue.Queue()
+
+def _discord_worker(supabase):
+    """Drain queued Discord notifications in the background"""
+    global _last_body_hash
+    while True:
+        message, media_attachments, post_id, doc = _discord_queue.get()
+        try:
+            send_to_discord(message, media_attachments)
+            logger.info(f"Successfully sent post {post_id} to Discord with @everyone")
+            # Persist only after delivery succeeded; until then the post is
+            # deduped by the cache alone, so a failed send can be retried
+            try:
+                flush_upserts(supabase, [doc])
+            except Exception as e:
+                logger.error(f"Failed to save delivered post {post_id} to Supabase: {e}")
+                logger.warning("Using cache to prevent duplicates until the next successful save")
+        except Exception as e:
+            logger.error(f"Failed to send post {post_id} to Discord: {e}")
+            # The post was never upserted, so dropping it from the cache lets
+            # a later poll pick it up and retry the send. The body-hash skip
+            # must also be reset, or an unchanged feed would short-circuit
+            # every following poll and the retry would never happen
+            processed_posts_cache.discard(post_id)
+            _last_body_hash = None
+        finally:
+            _discord_queue.task_done()
+
 def is_retweet(content):
     """Check if a post is a retweet by looking for RT pattern at the beginning"""
     if not content:
         return False
     
-    # Strip HTML tags first for accurate detection
-    text = BeautifulSoup(content, 'html.parser').get_text().strip()
-    
+    # Only the first few characters matter, so strip just the leading tags
+    # (e.g. '<p>' or '<p dir="ltr">') and test the prefix without scanning
+    # or parsing the whole body
+    head = _RE_LEADING_TAGS.sub('', content).lstrip()
+
     # Check if content starts with RT followed by space or @ (common retweet patterns)
     # Examples: "RT @username", "RT username", etc.
-    text_upper = text.upper()
-    return text_upper.startswith('RT ') or text_upper.startswith('RT@')
+    if _RE_RT.match(head):
+        return True
+    if '<' not in head[:8] and '&' not in head[:8]:
+        return False
+
+    # Markup or entities survived the cheap strip; fall back to a full parse
+    text = BeautifulSoup(content, 'lxml').get_text().strip()
+    return _RE_RT.match(text) is not None
 
 def contains_keyword(content):
     """Check if content contains any of the keywords (case-insensitive)"""
@@ -309,7 +512,7 @@ def contains_keyword(content):
         return False
     
     # Strip HTML tags and get clean text
-    text = BeautifulSoup(content, 'html.parser').get_text()
+    text = BeautifulSoup(content, 'lxml').get_text()
     text_lower = text.lower()
     
     # Check if any keyword is in the text
@@ -326,8 +529,21 @@ def clean_html_and_format(text):
         return ""
     
     # Parse HTML with BeautifulSoup
-    soup = BeautifulSoup(text, 'html.parser')
-    
+    soup = BeautifulSoup(text, 'lxml')
+
+    # Wrap link targets while we already have the DOM, instead of re-scanning
+    # the serialized text with a URL regex afterwards. Mention and hashtag
+    # anchors keep their text: wrapping those would turn every @user and #tag
+    # into its profile/tag URL
+    had_anchors = False
+    for anchor in soup.find_all('a', href=True):
+        had_anchors = True
+        classes = anchor.get('class') or []
+        rels = anchor.get('rel') or []
+        if 'mention' in classes or 'hashtag' in classes or 'tag' in rels:
+            continue
+        anchor.replace_with(f"<{anchor['href']}>")
+
     # Convert <br> and </p> to newlines
     for br in soup.find_all(['br', 'p']):
         br.replace_with('\n' + br.text)
@@ -336,37 +552,32 @@ def clean_html_and_format(text):
     text = soup.get_text()
     
     # Replace multiple newlines with double newline
-    text = re.sub(r'\n\s*\n', '\n\n', text)
-    
+    text = _RE_BLANKLINES.sub('\n\n', text)
+
     # Clean up extra whitespace
-    text = re.sub(r' +', ' ', text)
+    text = _RE_SPACES.sub(' ', text)
     text = text.strip()
-    
-    # Convert URLs to clickable format if not already
-    url_pattern = r'(?<![\(\[])(https?://\S+)(?![\)\]])'
-    text = re.sub(url_pattern, r'<\1>', text)
-    
+
+    # Posts sourced from the plain-text 'text' field carry no anchors, so
+    # their bare URLs still need wrapping to suppress Discord embeds
+    if not had_anchors:
+        text = _RE_URL.sub(r'<\1>', text)
+
     return text
 
 def format_discord_message(post):
-    """Format a post for Discord with media attachments and truncation"""
-    if not isinstance(post, dict):
-        logger.error(f"Invalid post format: {post}")
-        return None
-
+    """Format a Post for Discord with media attachments and truncation"""
     try:
-        created_at = datetime.fromisoformat(post.get('created_at', '').replace('Z', '+00:00'))
-        content = post.get('content') or post.get('text', '')
-        account = post.get('account', {})
-        username = account.get('username') or config.TRUTH_USERNAME
-        display_name = account.get('display_name', username)
-        
+        created_at = _parse_dt(post.created_at)
+        content = post.content
+        username = post.username or config.TRUTH_USERNAME
+        display_name = post.display_name or username
+
         # Clean and format the content
         content = clean_html_and_format(content)
         
         # Format message parts with exact newlines
-        post_type = config.POST_TYPE.capitalize()  # Ensure first letter is capitalized
-        header = f"**New {post_type} from {display_name} (@{username})**\n"
+        header = f"**New {_POST_TYPE_CAP} from {display_name} (@{username})**\n"
         footer = f"\n*Posted at: {created_at.strftime('%B %d, %Y at %I:%M %p %Z')}*"
         
         # Calculate max content length with safety margin
@@ -391,34 +602,57 @@ def format_discord_message(post):
         logger.error(f"Error formatting post: {e}")
         return None
 
+# Discord rejects uploads above this size, so don't bother downloading them
+DISCORD_MAX_UPLOAD_BYTES = 25 * 1024 * 1024
+
 def download_media(url):
-    """Download media from URL and return the content and filename"""
+    """Download media from URL and return a file-like object and filename"""
     try:
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        # Get filename from URL or Content-Disposition header
-        filename = url.split('/')[-1].split('?')[0]  # Remove query parameters
-        content_type = response.headers.get('content-type', '').lower()
-        
-        # Ensure proper file extension based on content type
-        if 'image/jpeg' in content_type and not filename.lower().endswith(('.jpg', '.jpeg')):
-            filename += '.jpg'
-        elif 'image/png' in content_type and not filename.lower().endswith('.png'):
-            filename += '.png'
-        elif 'image/gif' in content_type and not filename.lower().endswith('.gif'):
-            filename += '.gif'
-        elif 'video/' in content_type and not filename.lower().endswith(('.mp4', '.mov', '.webm')):
-            filename += '.mp4'
-            
-        return response.content, filename
+        with CLIENT.stream('GET', url) as response:
+            response.raise_for_status()
+
+            # Abort before downloading anything Discord would reject anyway
+            content_length = int(response.headers.get('content-length') or 0)
+            if content_length > DISCORD_MAX_UPLOAD_BYTES:
+                logger.warning(f"Skipping media from {url}: {content_length} bytes exceeds Discord's upload limit")
+                return None, None
+
+            # Get filename from URL or Content-Disposition header
+            filename = url.split('/')[-1].split('?')[0]  # Remove query parameters
+            content_type = response.headers.get('content-type', '').lower()
+
+            # Ensure proper file extension based on content type
+            if 'image/jpeg' in content_type and not filename.lower().endswith(('.jpg', '.jpeg')):
+                filename += '.jpg'
+            elif 'image/png' in content_type and not filename.lower().endswith('.png'):
+                filename += '.png'
+            elif 'image/gif' in content_type and not filename.lower().endswith('.gif'):
+                filename += '.gif'
+            elif 'video/' in content_type and not filename.lower().endswith(('.mp4', '.mov', '.webm')):
+                filename += '.mp4'
+
+            # Spool small files in memory and spill large videos to disk so a
+            # 50 MB download never sits fully in RAM. Enforce the size cap
+            # while streaming too, since Content-Length may be absent
+            media_file = tempfile.SpooledTemporaryFile(max_size=4 * 1024 * 1024)
+            bytes_written = 0
+            for chunk in response.iter_bytes():
+                bytes_written += len(chunk)
+                if bytes_written > DISCORD_MAX_UPLOAD_BYTES:
+                    logger.warning(f"Skipping media from {url}: exceeded Discord's upload limit mid-download")
+                    media_file.close()
+                    return None, None
+                media_file.write(chunk)
+            media_file.seek(0)
+            return media_file, filename
     except Exception as e:
         logger.error(f"Error downloading media from {url}: {e}")
         return None, None
 
 def get_truth_social_posts():
     """Get posts from Truth Social using Mastodon API via FlareSolverr"""
-    global cached_user_id
-    
+    global cached_user_id, _last_body_hash
+
     try:
         # Prepare headers that look like a real browser
         headers = {
@@ -439,7 +673,7 @@ def get_truth_social_posts():
                 raise ValueError(f"Could not find user ID for {config.TRUTH_USERNAME}")
                 
             cached_user_id = user_data['id']
-            logger.debug(f"Found and cached user ID: {cached_user_id}")
+            logger.debug("Found and cached user ID: %s", cached_user_id)
         
         user_id = cached_user_id
         
@@ -452,13 +686,25 @@ def get_truth_social_posts():
         }
         
         response = make_flaresolverr_request(posts_url, params=params, headers=headers)
+
+        # An unchanged body means an unchanged feed: skip the JSON parse and
+        # downstream classification entirely on the (common) idle path
+        body_hash = hashlib.sha1(response.text.encode()).hexdigest()
+        if body_hash == _last_body_hash:
+            logger.info("Posts unchanged since last check, skipping processing")
+            return []
+
         posts = response.json()
-        
+
         if not isinstance(posts, list):
             raise ValueError(f"Invalid posts response: {posts}")
-            
+
+        _last_body_hash = body_hash
+
         logger.info(f"Retrieved {len(posts)} posts")
-        return posts
+        # Parse the raw JSON into typed Posts once; everything downstream
+        # works with attributes instead of re-validating dicts
+        return [Post.from_json(p) for p in posts if isinstance(p, dict) and 'id' in p]
         
     except Exception as e:
         logger.error(f"Error getting Truth Social posts: {e}")
@@ -476,102 +722,101 @@ def main():
         logger.error(f"Failed to connect to Supabase in main: {e}")
         raise
 
+    # One query up front beats per-ID lookups while the cache repopulates
+    # after a restart
+    warm_processed_cache(supabase_client)
+
+    # Deliver Discord notifications off the poll loop
+    threading.Thread(target=_discord_worker, args=(supabase_client,), daemon=True).start()
+
+    # Consecutive polls without a new post; drives the adaptive delay below
+    idle_polls = 0
+
     while True:
+        post_delivered = False
         try:
             # Get posts
             posts = get_truth_social_posts()
-            
-            # Process posts in reverse chronological order (newest first)
-            # Only process the LATEST new post to avoid spamming on startup
-            for post in sorted(posts, key=lambda x: x.get('created_at', ''), reverse=True):
-                # Validate post structure
-                if not isinstance(post, dict) or 'id' not in post:
-                    logger.warning(f"Invalid post structure: {post}")
-                    continue
-                    
-                # Skip if already processed
-                if is_post_processed(supabase_client, post['id']):
-                    logger.debug(f"Post {post['id']} already processed, skipping")
-                    continue
-                
-                # Skip retweets - filter them out
-                content = post.get('content') or post.get('text', '')
-                if is_retweet(content):
-                    logger.info(f"Post {post['id']} is a retweet, skipping")
-                    # Mark as processed so we don't check it again
-                    processed_posts_cache.add(post['id'])
-                    try:
-                        # Save to Supabase to mark as processed (even though we're not sending it)
-                        mark_post_processed(supabase_client, post)
-                    except Exception as e:
-                        logger.debug(f"Could not save retweet to Supabase (non-critical): {e}")
-                    continue
-                
-                # Found a new post - process only this one (the latest)
-                logger.info(f"Processing new post {post['id']} (latest unprocessed post)")
-                
-                # Check if post contains any keywords
-                content = post.get('content') or post.get('text', '')
-                has_keyword = contains_keyword(content)
-                
-                if not has_keyword:
-                    logger.info(f"Post {post['id']} does not contain any keywords, skipping Discord notification")
+
+            # Check all IDs against Supabase in a single batch query instead
+            # of one round trip per post inside the loop
+            processed_posts_cache.update(prefetch_processed(supabase_client, [p.id for p in posts]))
+
+            # Docs to upsert in one batch at the end of this poll iteration
+            pending_upserts = []
+
+            # Classify every fresh post in one pass over the cache: retweets
+            # get bulk-marked as processed, the rest are delivery candidates
+            fresh = [p for p in posts if p.id not in processed_posts_cache]
+            retweets, new_posts = [], []
+            for p in fresh:
+                if is_retweet(p.content):
+                    retweets.append(p)
+                else:
+                    new_posts.append(p)
+
+            for p in retweets:
+                # Skip retweets - mark as processed so we don't check them again
+                logger.info(f"Post {p.id} is a retweet, skipping")
+                processed_posts_cache.add(p.id)
+                pending_upserts.append(build_post_doc(p))
+
+            # Only the LATEST new post is ever processed (avoids spamming on
+            # startup), so a single O(N) max() pass replaces sorting
+            latest = max(new_posts, key=lambda p: p.created_at, default=None)
+
+            if latest is not None:
+                post_id = latest.id
+
+                if not contains_keyword(latest.content):
+                    logger.info(f"Post {post_id} does not contain any keywords, skipping Discord notification")
                     # Still mark as processed so we don't check it again
-                    processed_posts_cache.add(post['id'])
-                    try:
-                        mark_post_processed(supabase_client, post)
-                    except Exception as e:
-                        logger.debug(f"Could not save non-keyword post to Supabase (non-critical): {e}")
-                    continue
-                
-                # Post contains keywords - format and send with @everyone
-                logger.info(f"Post {post['id']} contains keywords, sending to Discord with @everyone")
-                
-                # Format message first
-                message = format_discord_message(post)
-                if not message:
-                    logger.warning(f"Could not format message for post {post['id']}, skipping")
-                    continue
-                
-                # Add @everyone mention at the beginning
-                message = f"@everyone\n{message}"
-                
-                media_attachments = post.get('media_attachments', [])
-                post_id = post['id']
-                
-                try:
-                    # Try to save to Supabase first
-                    mark_post_processed(supabase_client, post)
-                    logger.info(f"Successfully saved post {post_id} to Supabase")
-                except Exception as e:
-                    logger.error(f"Failed to save post {post_id} to Supabase: {e}")
-                    logger.warning(f"Will still send to Discord and use cache to prevent duplicates")
-                
-                # Add to cache to prevent duplicates (even if Supabase save failed)
-                processed_posts_cache.add(post_id)
-                
-                # Send to Discord (even if Supabase save failed, we use cache to prevent duplicates)
-                try:
-                    send_to_discord(message, media_attachments)
-                    logger.info(f"Successfully sent post {post_id} to Discord with @everyone")
-                except Exception as e:
-                    logger.error(f"Failed to send post {post_id} to Discord: {e}")
-                    # Remove from cache if Discord send failed, so we can retry later
-                    processed_posts_cache.discard(post_id)
-                    raise
-                
-                # IMPORTANT: Only process the latest new post, then break
-                # This prevents spamming old posts on startup
-                logger.info(f"Processed latest new post. Stopping here to avoid processing older posts.")
-                break
-                
+                    processed_posts_cache.add(post_id)
+                    pending_upserts.append(build_post_doc(latest))
+                else:
+                    # Post contains keywords - format and send with @everyone
+                    logger.info(f"Post {post_id} contains keywords, sending to Discord with @everyone")
+                    message = format_discord_message(latest)
+                    if not message:
+                        logger.warning(f"Could not format message for post {post_id}, skipping")
+                    else:
+                        # Add @everyone mention at the beginning
+                        message = f"@everyone\n{message}"
+
+                        # Cache now to prevent duplicates; the Supabase upsert
+                        # is deferred to the worker so it only happens once
+                        # delivery is confirmed
+                        processed_posts_cache.add(post_id)
+
+                        # Hand off to the Discord worker; the worker un-caches
+                        # the post on failure so a later poll can retry it
+                        _discord_queue.put((message, latest.media, post_id, build_post_doc(latest)))
+                        logger.info(f"Queued post {post_id} for Discord delivery")
+                        post_delivered = True
+
+            # One round trip marks everything from this iteration as processed
+            try:
+                flush_upserts(supabase_client, pending_upserts)
+            except Exception as e:
+                logger.error(f"Failed to save processed posts to Supabase: {e}")
+                logger.warning("Using cache to prevent duplicates until the next successful save")
+
         except Exception as e:
             logger.error(f"Error in main loop: {e}")
         
-        delay = int(config.REPEAT_DELAY)
-        if delay < 5:
-            logger.warning(f"REPEAT_DELAY is very low ({delay}s). Consider at least 5 seconds to avoid rate limiting.")
-        logger.info(f"Waiting {delay} seconds before next check...")
+        # Back off multiplicatively while the account is quiet and snap back
+        # to the base delay as soon as a post is delivered, so idle accounts
+        # don't burn a full FlareSolverr request every REPEAT_DELAY seconds
+        if post_delivered:
+            idle_polls = 0
+        else:
+            idle_polls += 1
+
+        base_delay = int(config.REPEAT_DELAY)
+        if base_delay < 5:
+            logger.warning(f"REPEAT_DELAY is very low ({base_delay}s). Consider at least 5 seconds to avoid rate limiting.")
+        delay = min(base_delay * (2 ** min(idle_polls, 4)), 3600)
+        logger.info(f"Waiting {delay} seconds before next check (idle polls: {idle_polls})...")
         time.sleep(delay)
 
 if __name__ == "__main__":